@@ -1,14 +1,24 @@
+import asyncio
+import hashlib
 import os
 import logging
-import uuid
 import re
-from datetime import datetime
+import threading
+import time
+import uuid
+import weakref
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, Optional, Dict
 
-from fastapi import FastAPI, APIRouter, HTTPException, Query
+from cachetools import TTLCache
+from fastapi import FastAPI, APIRouter, Header, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import AsyncMongoClient, ReturnDocument
+from pymongo.errors import OperationFailure
+from pymongo.operations import SearchIndexModel
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
@@ -25,21 +35,150 @@ allowed_origins = os.environ.get('ALLOWED_ORIGINS', '*').split(',')
 if not mongo_url or not db_name:
     raise RuntimeError("Missing environment variables: MONGO_URL and DB_NAME must be set.")
 
-# Initialize MongoDB Client
-client = AsyncIOMotorClient(mongo_url)
-db = client[db_name]
+# --- MongoDB Client ---
+# Keep a warm pool so bursts of traffic after idle periods skip connection
+# setup, and compress wire traffic since rack listings are large.
+MONGO_CLIENT_OPTIONS = {
+    "maxPoolSize": 50,
+    "minPoolSize": 10,
+    "maxIdleTimeMS": 60000,
+    "serverSelectionTimeoutMS": 2000,
+    "compressors": "zstd,zlib",
+    # Return stored datetimes as UTC-aware, matching what the write paths send back
+    "tz_aware": True,
+}
+
+class MongoClientPool:
+    """Lazily creates one AsyncMongoClient per running event loop.
+
+    An AsyncMongoClient is bound to the loop it was first used on, so workers
+    and test runners that start their own loops each get a dedicated client.
+    """
+
+    def __init__(self, url: str, **client_options):
+        self.url = url
+        self.client_options = client_options
+        self._clients = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get_client(self) -> AsyncMongoClient:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None:
+                client = self._clients[loop] = AsyncMongoClient(self.url, **self.client_options)
+        return client
+
+    async def close(self):
+        """Close the client owned by the running event loop, if any."""
+        with self._lock:
+            client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+mongo_pool = MongoClientPool(mongo_url, **MONGO_CLIENT_OPTIONS)
+
+def get_db():
+    """Return the application database for the running event loop."""
+    return mongo_pool.get_client()[db_name]
+
+# Regular indexes on the racks collection, keyed by index name
+RACK_INDEXES = {
+    "floor_1_rackNumber_1": [("floor", 1), ("rackNumber", 1)],
+    "rackNumber_1": [("rackNumber", 1)],
+}
+
+# Atlas Search index backing the search endpoint; floor is also a token field
+# so searches can be narrowed to a single floor with an equality filter
+SEARCH_INDEX_NAME = "rack_search"
+SEARCH_RESULT_LIMIT = 100
+AUTOCOMPLETE_LIMIT = 20
+SEARCH_INDEX_DEFINITION = {"mappings": {"dynamic": False, "fields": {
+    "rackNumber": {"type": "string"},
+    "floor": [{"type": "string"}, {"type": "token"}],
+    "items": {"type": "string"}
+}}}
 
-app = FastAPI(title="Madan Store Inventory API")
+# Deployments without Atlas Search (a plain mongod) fall back to this $text
+# index; cleared at startup when the search index cannot be managed
+TEXT_INDEX_NAME = "rack_text"
+TEXT_INDEX_KEYS = [("rackNumber", "text"), ("floor", "text"), ("items", "text")]
+atlas_search_available = True
+
+# Short-lived cache for repeated (typeahead) searches. Keys include a write
+# generation so any create/update/delete makes older entries unreachable.
+# Atlas Search indexes writes asynchronously, so a search just after a write
+# can miss it; results are not cached for SEARCH_INDEX_LAG seconds after a
+# write, and a cached result is at most SEARCH_CACHE_TTL seconds old.
+SEARCH_INDEX_LAG = 5.0
+SEARCH_CACHE_TTL = 5.0
+search_cache = TTLCache(maxsize=1024, ttl=SEARCH_CACHE_TTL)
+write_generation = 0
+last_write_at = float("-inf")
+
+def invalidate_search_cache():
+    global write_generation, last_write_at
+    write_generation += 1
+    last_write_at = time.monotonic()
+
+# Collection-wide data version used for ETags. Every write bumps the counter in
+# racks_meta; reads cache it briefly so polling clients cost one lookup at most.
+DATA_VERSION_TTL = 1.0
+data_version = None
+data_version_expires = 0.0
+
+async def get_data_version() -> int:
+    """Return the current racks data version, cached in-process for a second."""
+    global data_version, data_version_expires
+    now = time.monotonic()
+    if data_version is None or now >= data_version_expires:
+        doc = await get_db().racks_meta.find_one({"_id": "version"})
+        data_version = doc["v"] if doc else 0
+        data_version_expires = now + DATA_VERSION_TTL
+    return data_version
+
+async def record_write():
+    """Bump the data version and drop cached reads after a create/update/delete."""
+    global data_version
+    await get_db().racks_meta.update_one({"_id": "version"}, {"$inc": {"v": 1}}, upsert=True)
+    # This process sees its own writes immediately
+    data_version = None
+    invalidate_search_cache()
+
+def make_etag(version: int, *parts) -> str:
+    """Build a weak ETag for a data version and the request parameters.
+
+    Parameters are hashed rather than embedded: header values must be
+    latin-1, and a raw floor name may also contain quotes.
+    """
+    digest = hashlib.sha1("\0".join(str(part) for part in parts).encode()).hexdigest()[:16]
+    return f'W/"{version}-{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    return any(tag.strip() in (etag, "*") for tag in if_none_match.split(","))
+
+app = FastAPI(title="Madan Store Inventory API", default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 
+def utc_now() -> datetime:
+    """Current UTC time at the millisecond precision MongoDB stores."""
+    now = datetime.now(timezone.utc)
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
 # --- Pydantic Models ---
 class Rack(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     rackNumber: str
     floor: str
     items: List[str] = Field(default_factory=list)
-    createdAt: datetime = Field(default_factory=datetime.utcnow)
-    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+    createdAt: datetime
+    updatedAt: datetime
+
+# Inclusion projection for Rack documents (every field except Mongo's _id)
+RACK_FIELDS = {field: 1 for field in Rack.model_fields}
 
 class RackCreate(BaseModel):
     rackNumber: str
@@ -55,79 +194,193 @@ class RackSearchResponse(BaseModel):
     racks: List[Rack]
     matchedItems: Dict[str, List[str]]
 
+class RackPageResponse(BaseModel):
+    floors: Dict[str, List[Rack]]
+    nextCursor: Optional[str] = None
+
 # --- Endpoints ---
 
-@api_router.get("/racks", response_model=Dict[str, List[Rack]])
-async def get_all_racks(page: int = Query(1, ge=1), limit: int = Query(5, ge=1)):
-    """Fetch racks grouped by floor with pagination."""
+@api_router.get("/")
+async def root():
+    """Health check used by clients and the test suite."""
+    return {"message": "MADAN STORE Inventory API is running"}
+
+@api_router.get("/racks", responses={200: {"model": RackPageResponse}})
+async def get_all_racks(
+    response: Response,
+    after_floor: Optional[str] = None,
+    limit: int = Query(5, ge=1),
+    if_none_match: Optional[str] = Header(None)
+):
+    """Fetch racks grouped by floor, paginated by floor name (keyset cursor)."""
     try:
-        skip = (page - 1) * limit
-        # Get distinct floors to determine pagination order
-        all_floors = await db.racks.distinct("floor")
-        all_floors.sort()
-        paginated_floors = all_floors[skip : skip + limit]
+        etag = make_etag(await get_data_version(), after_floor or "", limit)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
         
-        if not paginated_floors: 
-            return {}
-
-        # Aggregate query to group by floor
+        # Range-scan the floor index from the cursor instead of skipping earlier floors
+        match = {"floor": {"$gt": after_floor}} if after_floor else {}
         pipeline = [
-            {"$match": {"floor": {"$in": paginated_floors}}},
-            {"$sort": {"rackNumber": 1}},
+            {"$match": match},
+            {"$project": {"_id": 0}},
+            {"$sort": {"floor": 1, "rackNumber": 1}},
             {"$group": {"_id": "$floor", "racks": {"$push": "$$ROOT"}}},
-            {"$sort": {"_id": 1}}
+            {"$sort": {"_id": 1}},
+            {"$limit": limit}
         ]
-        results = await db.racks.aggregate(pipeline).to_list(length=limit)
-        return {res["_id"]: [Rack(**r) for r in res["racks"]] for res in results}
+        # Stored documents were validated on write, so they are returned as-is.
+        # One batch holds the whole page, so no getMore round trip is needed.
+        floors = {}
+        async for res in await get_db().racks.aggregate(pipeline, batchSize=limit):
+            floors[res["_id"]] = res["racks"]
+        # A short page means there are no floors left to fetch
+        next_cursor = next(reversed(floors)) if len(floors) == limit else None
+        return {"floors": floors, "nextCursor": next_cursor}
     except Exception as e:
         logging.error(f"Fetch error: {e}")
         raise HTTPException(status_code=500, detail="Database fetch failed")
 
-@api_router.post("/racks", response_model=Rack)
+# Writes return plain documents serialized by ORJSONResponse, like the read
+# endpoints, so timestamps are formatted the same way on every endpoint
+
+@api_router.post("/racks", responses={200: {"model": Rack}})
 async def create_rack(rack_data: RackCreate):
     """Create a new rack entry."""
-    rack_obj = Rack(**rack_data.model_dump())
-    await db.racks.insert_one(rack_obj.model_dump())
-    return rack_obj
+    now = utc_now()
+    # The request body is already validated, so skip a second validation pass
+    rack = Rack.model_construct(**rack_data.model_dump(), createdAt=now, updatedAt=now).model_dump()
+    # insert_one adds _id to the document it is given, so insert a copy
+    await get_db().racks.insert_one(dict(rack))
+    await record_write()
+    return rack
 
-@api_router.get("/racks/search", response_model=RackSearchResponse)
-async def search_racks(q: str = Query(..., min_length=1)):
-    """Search for racks or items using text indexing."""
-    query = {"$text": {"$search": q}}
-    cursor = db.racks.find(query).limit(100)
-    racks = await cursor.to_list(length=100)
-    rack_objects = [Rack(**rack) for rack in racks]
+@api_router.post("/racks/bulk", responses={200: {"model": List[Rack]}})
+async def create_racks_bulk(racks_data: List[RackCreate]):
+    """Create many rack entries with a single unordered insert."""
+    if not racks_data:
+        raise HTTPException(status_code=400, detail="No racks provided")
     
-    # Identify which specific items matched the search query for highlighting
+    # Request bodies are already validated, so skip a second validation pass
+    now = utc_now()
+    racks = [
+        Rack.model_construct(**rack.model_dump(), createdAt=now, updatedAt=now).model_dump()
+        for rack in racks_data
+    ]
+    await get_db().racks.insert_many([dict(rack) for rack in racks], ordered=False)
+    await record_write()
+    return racks
+
+async def atlas_search(q: str, floor: Optional[str]):
+    """Run a search through the Atlas Search index, with item highlights."""
+    text = {"text": {"query": q, "path": ["items", "rackNumber", "floor"]}}
+    if floor:
+        # Filter clauses narrow the candidate set without affecting scoring
+        operator = {"compound": {"must": [text], "filter": [{"equals": {"path": "floor", "value": floor}}]}}
+    else:
+        operator = text
+    pipeline = [
+        {"$search": {"index": SEARCH_INDEX_NAME, **operator, "highlight": {"path": "items"}}},
+        {"$limit": SEARCH_RESULT_LIMIT},
+        {"$project": {"_id": 0, "highlights": {"$meta": "searchHighlights"}, **RACK_FIELDS}}
+    ]
+    racks = []
+    matched_items = {}
+    async for doc in await get_db().racks.aggregate(pipeline, batchSize=SEARCH_RESULT_LIMIT):
+        highlights = doc.pop("highlights", [])
+        racks.append(doc)
+        # Rebuild each highlighted item from its text fragments, keeping first-seen order
+        hits = dict.fromkeys("".join(t["value"] for t in h["texts"]) for h in highlights)
+        if hits:
+            matched_items[doc["id"]] = list(hits)
+    return racks, matched_items
+
+async def text_search(q: str, floor: Optional[str]):
+    """Run a search through the $text index when Atlas Search is unavailable."""
+    query = {"$text": {"$search": q}}
+    if floor:
+        query["floor"] = floor
+    cursor = get_db().racks.find(query, projection={"_id": 0}).limit(SEARCH_RESULT_LIMIT)
+    racks = await cursor.to_list(length=SEARCH_RESULT_LIMIT)
+    # $text has no highlights, so matched items are found by substring instead
     search_regex = re.compile(re.escape(q), re.IGNORECASE)
-    matched_items = {r.id: [i for i in r.items if search_regex.search(i)] for r in rack_objects}
-    # Filter out empty results
-    matched_items = {k: v for k, v in matched_items.items() if v}
+    matched_items = {}
+    for rack in racks:
+        hits = [item for item in rack["items"] if search_regex.search(item)]
+        if hits:
+            matched_items[rack["id"]] = hits
+    return racks, matched_items
+
+@api_router.get("/racks/search", responses={200: {"model": RackSearchResponse}})
+async def search_racks(q: str = Query(..., min_length=1), floor: Optional[str] = None):
+    """Search for racks or items, optionally within one floor."""
+    cache_key = (q.lower().strip(), floor, write_generation)
+    cached = search_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
-    return RackSearchResponse(racks=rack_objects, matchedItems=matched_items)
+    if atlas_search_available:
+        racks, matched_items = await atlas_search(q, floor)
+    else:
+        racks, matched_items = await text_search(q, floor)
+    
+    response = {"racks": racks, "matchedItems": matched_items}
+    if time.monotonic() - last_write_at >= SEARCH_INDEX_LAG:
+        search_cache[cache_key] = response
+    return response
+
+@api_router.get("/racks/autocomplete", responses={200: {"model": List[Rack]}})
+async def autocomplete_racks(prefix: str = Query(..., min_length=1), floor: Optional[str] = None):
+    """Suggest racks whose rack number starts with the given prefix."""
+    # An anchored, case-sensitive regex is served as a range scan on the rackNumber index
+    query = {"rackNumber": {"$regex": f"^{re.escape(prefix)}"}}
+    if floor:
+        query["floor"] = floor
+    cursor = get_db().racks.find(query, projection={"_id": 0}).sort("rackNumber", 1).limit(AUTOCOMPLETE_LIMIT)
+    return await cursor.to_list(length=AUTOCOMPLETE_LIMIT)
+
+@api_router.get("/racks/{rack_id}", responses={200: {"model": Rack}})
+async def get_rack(rack_id: str, response: Response, if_none_match: Optional[str] = Header(None)):
+    """Fetch a single rack by its unique ID."""
+    etag = make_etag(await get_data_version(), rack_id)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    rack = await get_db().racks.find_one({"id": rack_id}, projection={"_id": 0})
+    if rack is None:
+        raise HTTPException(status_code=404, detail="Rack not found")
+    response.headers["ETag"] = etag
+    return rack
 
-@api_router.put("/racks/{rack_id}", response_model=Rack)
+@api_router.put("/racks/{rack_id}", responses={200: {"model": Rack}})
 async def update_rack(rack_id: str, rack_update: RackUpdate):
     """Update an existing rack by its unique ID."""
     update_data = {k: v for k, v in rack_update.model_dump().items() if v is not None}
     if not update_data:
         raise HTTPException(status_code=400, detail="No data provided for update")
         
-    update_data["updatedAt"] = datetime.utcnow()
-    result = await db.racks.update_one({"id": rack_id}, {"$set": update_data})
+    update_data["updatedAt"] = utc_now()
+    # Write and read back the updated document atomically in one round trip
+    updated = await get_db().racks.find_one_and_update(
+        {"id": rack_id},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
     
-    if result.matched_count == 0:
+    if updated is None:
         raise HTTPException(status_code=404, detail="Rack not found")
         
-    updated = await db.racks.find_one({"id": rack_id})
-    return Rack(**updated)
+    await record_write()
+    return updated
 
 @api_router.delete("/racks/{rack_id}")
 async def delete_rack(rack_id: str):
     """Remove a rack from the database."""
-    result = await db.racks.delete_one({"id": rack_id})
+    result = await get_db().racks.delete_one({"id": rack_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Rack not found")
+    await record_write()
     return {"message": "Deleted successfully"}
 
 # --- Middleware & Setup ---
@@ -142,15 +395,46 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Rack listings and search results are large, highly compressible JSON
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+async def ensure_indexes():
+    """Create any regular indexes that do not exist yet."""
+    racks = get_db().racks
+    existing = await racks.index_information()
+    missing = [(name, keys) for name, keys in RACK_INDEXES.items() if name not in existing]
+    await asyncio.gather(*(
+        racks.create_index(keys, name=name, background=True) for name, keys in missing
+    ))
+
+async def ensure_search_index():
+    """Create or refresh the Atlas Search index used by the search endpoint."""
+    global atlas_search_available
+    racks = get_db().racks
+    try:
+        # Atlas Search indexes are managed separately and must not be created twice
+        existing = await (await racks.list_search_indexes(SEARCH_INDEX_NAME)).to_list(length=1)
+        if not existing:
+            await racks.create_search_index(
+                SearchIndexModel(definition=SEARCH_INDEX_DEFINITION, name=SEARCH_INDEX_NAME)
+            )
+        elif existing[0].get("latestDefinition") != SEARCH_INDEX_DEFINITION:
+            await racks.update_search_index(SEARCH_INDEX_NAME, SEARCH_INDEX_DEFINITION)
+    except OperationFailure as e:
+        # Only Atlas supports search indexes; a plain mongod searches with $text instead
+        logging.warning(f"Atlas Search unavailable, falling back to $text search: {e}")
+        atlas_search_available = False
+        await racks.create_index(TEXT_INDEX_KEYS, name=TEXT_INDEX_NAME, background=True)
+
 @app.on_event("startup")
 async def startup_db():
-    """Create necessary text indexes for search functionality."""
-    await db.racks.create_index([
-        ("rackNumber", "text"), 
-        ("floor", "text"), 
-        ("items", "text")
-    ])
-    await db.racks.create_index([("floor", 1), ("rackNumber", 1)])
+    """Create the indexes needed for pagination and search."""
+    await asyncio.gather(ensure_indexes(), ensure_search_index())
+
+@app.on_event("shutdown")
+async def shutdown_db():
+    """Close this loop's MongoDB client."""
+    await mongo_pool.close()
 
 # Required for Render Deployment
 if __name__ == "__main__":
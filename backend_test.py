@@ -2,394 +2,300 @@
 """
 Backend Test Suite for MADAN STORE Rack & Inventory Management System
 Tests all API endpoints with comprehensive scenarios
+
+Install the test dependencies with `pip install -r requirements-test.txt`.
+
+Run with pytest; independent tests are spread across workers while the
+tests sharing the created racks stay together on one worker, and an HTML
+report is written for CI. The run stops at the first failure and starts
+with whatever failed last time; if the API root (GET /api/) is down the
+whole run aborts before any other request is made:
+
+    pytest backend_test.py -x --ff -n auto --dist=loadgroup --html=report.html --self-contained-html
+
+Add --rack-count=N to seed N extra generated racks for throughput runs.
 """
 
-import requests
-import json
+import re
+import sys
 import time
-from typing import Dict, List, Any
-
-# Configuration
-BASE_URL = "https://374afd2f-5ee9-4ce8-9228-83f6ad638fdc.preview.emergentagent.com/api"
-TIMEOUT = 30
-
-class RackInventoryTester:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.timeout = TIMEOUT
-        self.created_racks = []  # Track created racks for cleanup
-        self.test_results = {
-            "passed": 0,
-            "failed": 0,
-            "errors": []
-        }
-
-    def log_result(self, test_name: str, success: bool, message: str = ""):
-        """Log test results"""
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status}: {test_name}")
-        if message:
-            print(f"   {message}")
-        
-        if success:
-            self.test_results["passed"] += 1
-        else:
-            self.test_results["failed"] += 1
-            self.test_results["errors"].append(f"{test_name}: {message}")
-
-    def test_root_endpoint(self):
-        """Test GET /api/ - Root endpoint"""
-        try:
-            response = self.session.get(f"{BASE_URL}/")
-            
-            if response.status_code == 200:
-                data = response.json()
-                if "message" in data and "MADAN STORE" in data["message"]:
-                    self.log_result("Root Endpoint", True, f"Response: {data['message']}")
-                else:
-                    self.log_result("Root Endpoint", False, f"Unexpected response: {data}")
-            else:
-                self.log_result("Root Endpoint", False, f"Status: {response.status_code}, Response: {response.text}")
-                
-        except Exception as e:
-            self.log_result("Root Endpoint", False, f"Exception: {str(e)}")
-
-    def test_create_racks(self):
-        """Test POST /api/racks - Create new racks with different floor and item combinations"""
-        test_racks = [
-            {
-                "rackNumber": "R001",
-                "floor": "Ground Floor",
-                "items": ["Electronics", "Mobile Phones", "Chargers", "Headphones"]
-            },
-            {
-                "rackNumber": "R002", 
-                "floor": "Ground Floor",
-                "items": ["Cables", "USB Cables", "HDMI Cables", "Power Cables"]
-            },
-            {
-                "rackNumber": "R101",
-                "floor": "1st Floor", 
-                "items": ["Batteries", "AA Batteries", "AAA Batteries", "Rechargeable Batteries"]
-            },
-            {
-                "rackNumber": "R102",
-                "floor": "1st Floor",
-                "items": ["Computer Accessories", "Keyboards", "Mouse", "Webcams"]
-            },
-            {
-                "rackNumber": "R201",
-                "floor": "2nd Floor",
-                "items": ["Storage Devices", "Hard Drives", "USB Drives", "Memory Cards"]
-            }
-        ]
-
-        for i, rack_data in enumerate(test_racks):
-            try:
-                response = self.session.post(f"{BASE_URL}/racks", json=rack_data)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if all(key in data for key in ["id", "rackNumber", "floor", "items"]):
-                        self.created_racks.append(data["id"])
-                        self.log_result(f"Create Rack {rack_data['rackNumber']}", True, 
-                                      f"Created with ID: {data['id']}")
-                    else:
-                        self.log_result(f"Create Rack {rack_data['rackNumber']}", False, 
-                                      f"Missing required fields in response: {data}")
-                else:
-                    self.log_result(f"Create Rack {rack_data['rackNumber']}", False, 
-                                  f"Status: {response.status_code}, Response: {response.text}")
-                    
-            except Exception as e:
-                self.log_result(f"Create Rack {rack_data['rackNumber']}", False, f"Exception: {str(e)}")
-
-    def test_get_all_racks(self):
-        """Test GET /api/racks - Get all racks grouped by floor"""
-        try:
-            response = self.session.get(f"{BASE_URL}/racks")
-            
-            if response.status_code == 200:
-                data = response.json()
-                if isinstance(data, dict):
-                    floors_found = list(data.keys())
-                    total_racks = sum(len(racks) for racks in data.values())
-                    
-                    expected_floors = ["Ground Floor", "1st Floor", "2nd Floor"]
-                    floors_match = all(floor in floors_found for floor in expected_floors)
-                    
-                    if floors_match and total_racks >= 5:
-                        self.log_result("Get All Racks", True, 
-                                      f"Found {total_racks} racks across floors: {floors_found}")
-                    else:
-                        self.log_result("Get All Racks", False, 
-                                      f"Expected floors not found or insufficient racks. Floors: {floors_found}, Total: {total_racks}")
-                else:
-                    self.log_result("Get All Racks", False, f"Expected dict response, got: {type(data)}")
-            else:
-                self.log_result("Get All Racks", False, f"Status: {response.status_code}, Response: {response.text}")
-                
-        except Exception as e:
-            self.log_result("Get All Racks", False, f"Exception: {str(e)}")
-
-    def test_get_specific_rack(self):
-        """Test GET /api/racks/{rack_id} - Get specific rack by ID"""
-        if not self.created_racks:
-            self.log_result("Get Specific Rack", False, "No racks available for testing")
-            return
-
-        # Test with valid rack ID
-        rack_id = self.created_racks[0]
-        try:
-            response = self.session.get(f"{BASE_URL}/racks/{rack_id}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("id") == rack_id:
-                    self.log_result("Get Specific Rack (Valid ID)", True, 
-                                  f"Retrieved rack: {data.get('rackNumber')} on {data.get('floor')}")
-                else:
-                    self.log_result("Get Specific Rack (Valid ID)", False, 
-                                  f"ID mismatch. Expected: {rack_id}, Got: {data.get('id')}")
-            else:
-                self.log_result("Get Specific Rack (Valid ID)", False, 
-                              f"Status: {response.status_code}, Response: {response.text}")
-                
-        except Exception as e:
-            self.log_result("Get Specific Rack (Valid ID)", False, f"Exception: {str(e)}")
-
-        # Test with invalid rack ID
-        try:
-            invalid_id = "invalid-rack-id-12345"
-            response = self.session.get(f"{BASE_URL}/racks/{invalid_id}")
-            
-            if response.status_code == 404:
-                self.log_result("Get Specific Rack (Invalid ID)", True, "Correctly returned 404 for invalid ID")
-            else:
-                self.log_result("Get Specific Rack (Invalid ID)", False, 
-                              f"Expected 404, got {response.status_code}")
-                
-        except Exception as e:
-            self.log_result("Get Specific Rack (Invalid ID)", False, f"Exception: {str(e)}")
-
-    def test_update_rack(self):
-        """Test PUT /api/racks/{rack_id} - Update rack information"""
-        if not self.created_racks:
-            self.log_result("Update Rack", False, "No racks available for testing")
-            return
-
-        rack_id = self.created_racks[0]
-        update_data = {
-            "rackNumber": "R001-UPDATED",
-            "floor": "Ground Floor",
-            "items": ["Electronics", "Mobile Phones", "Chargers", "Headphones", "Tablets"]
-        }
-
-        try:
-            response = self.session.put(f"{BASE_URL}/racks/{rack_id}", json=update_data)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if (data.get("rackNumber") == update_data["rackNumber"] and 
-                    len(data.get("items", [])) == 5):
-                    self.log_result("Update Rack", True, 
-                                  f"Successfully updated rack to: {data.get('rackNumber')}")
-                else:
-                    self.log_result("Update Rack", False, 
-                                  f"Update not reflected properly: {data}")
-            else:
-                self.log_result("Update Rack", False, 
-                              f"Status: {response.status_code}, Response: {response.text}")
-                
-        except Exception as e:
-            self.log_result("Update Rack", False, f"Exception: {str(e)}")
-
-    def test_search_functionality(self):
-        """Test GET /api/racks/search?q={query} - Search functionality"""
-        search_tests = [
-            {
-                "query": "R001",
-                "description": "Search by rack number",
-                "expected_min_results": 1
-            },
-            {
-                "query": "Ground",
-                "description": "Search by floor name",
-                "expected_min_results": 2
-            },
-            {
-                "query": "Electronics",
-                "description": "Search by item name",
-                "expected_min_results": 1
-            },
-            {
-                "query": "Batteries",
-                "description": "Search for batteries",
-                "expected_min_results": 1
-            },
-            {
-                "query": "nonexistent",
-                "description": "Search for non-existent item",
-                "expected_min_results": 0
-            }
-        ]
-
-        for test in search_tests:
-            try:
-                response = self.session.get(f"{BASE_URL}/racks/search", params={"q": test["query"]})
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if "racks" in data and "matchedItems" in data:
-                        racks_count = len(data["racks"])
-                        matched_items = data["matchedItems"]
-                        
-                        if racks_count >= test["expected_min_results"]:
-                            self.log_result(f"Search: {test['description']}", True, 
-                                          f"Found {racks_count} racks, matched items: {len(matched_items)}")
-                        else:
-                            self.log_result(f"Search: {test['description']}", False, 
-                                          f"Expected >= {test['expected_min_results']}, got {racks_count}")
-                    else:
-                        self.log_result(f"Search: {test['description']}", False, 
-                                      f"Missing required fields in response: {data}")
-                else:
-                    self.log_result(f"Search: {test['description']}", False, 
-                                  f"Status: {response.status_code}, Response: {response.text}")
-                    
-            except Exception as e:
-                self.log_result(f"Search: {test['description']}", False, f"Exception: {str(e)}")
-
-    def test_search_edge_cases(self):
-        """Test search edge cases"""
-        # Test empty search (should fail)
-        try:
-            response = self.session.get(f"{BASE_URL}/racks/search", params={"q": ""})
-            if response.status_code == 422:  # Validation error expected
-                self.log_result("Search Edge Case: Empty Query", True, "Correctly rejected empty search")
-            else:
-                self.log_result("Search Edge Case: Empty Query", False, 
-                              f"Expected 422, got {response.status_code}")
-        except Exception as e:
-            self.log_result("Search Edge Case: Empty Query", False, f"Exception: {str(e)}")
-
-        # Test special characters
-        try:
-            response = self.session.get(f"{BASE_URL}/racks/search", params={"q": "R0*1"})
-            if response.status_code == 200:
-                self.log_result("Search Edge Case: Special Characters", True, "Handled special characters")
-            else:
-                self.log_result("Search Edge Case: Special Characters", False, 
-                              f"Status: {response.status_code}")
-        except Exception as e:
-            self.log_result("Search Edge Case: Special Characters", False, f"Exception: {str(e)}")
-
-    def test_delete_rack(self):
-        """Test DELETE /api/racks/{rack_id} - Delete rack"""
-        if not self.created_racks:
-            self.log_result("Delete Rack", False, "No racks available for testing")
-            return
-
-        # Test deleting the last created rack
-        rack_id = self.created_racks[-1]
-        try:
-            response = self.session.delete(f"{BASE_URL}/racks/{rack_id}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                if "message" in data and "deleted" in data["message"].lower():
-                    self.created_racks.remove(rack_id)
-                    self.log_result("Delete Rack (Valid ID)", True, f"Successfully deleted rack: {rack_id}")
-                else:
-                    self.log_result("Delete Rack (Valid ID)", False, f"Unexpected response: {data}")
-            else:
-                self.log_result("Delete Rack (Valid ID)", False, 
-                              f"Status: {response.status_code}, Response: {response.text}")
-                
-        except Exception as e:
-            self.log_result("Delete Rack (Valid ID)", False, f"Exception: {str(e)}")
-
-        # Test deleting non-existent rack
-        try:
-            invalid_id = "non-existent-rack-id"
-            response = self.session.delete(f"{BASE_URL}/racks/{invalid_id}")
-            
-            if response.status_code == 404:
-                self.log_result("Delete Rack (Invalid ID)", True, "Correctly returned 404 for invalid ID")
-            else:
-                self.log_result("Delete Rack (Invalid ID)", False, 
-                              f"Expected 404, got {response.status_code}")
-                
-        except Exception as e:
-            self.log_result("Delete Rack (Invalid ID)", False, f"Exception: {str(e)}")
-
-    def cleanup_remaining_racks(self):
-        """Clean up any remaining test racks"""
-        print("\n🧹 Cleaning up remaining test racks...")
-        for rack_id in self.created_racks[:]:
-            try:
-                response = self.session.delete(f"{BASE_URL}/racks/{rack_id}")
-                if response.status_code == 200:
-                    print(f"   Cleaned up rack: {rack_id}")
-                    self.created_racks.remove(rack_id)
-            except Exception as e:
-                print(f"   Failed to cleanup rack {rack_id}: {e}")
-
-    def run_all_tests(self):
-        """Run all backend tests"""
-        print("🚀 Starting MADAN STORE Backend API Tests")
-        print("=" * 60)
-        
-        # Test sequence
-        self.test_root_endpoint()
-        print()
-        
-        self.test_create_racks()
-        print()
-        
-        self.test_get_all_racks()
-        print()
-        
-        self.test_get_specific_rack()
-        print()
-        
-        self.test_update_rack()
-        print()
-        
-        self.test_search_functionality()
-        print()
-        
-        self.test_search_edge_cases()
-        print()
-        
-        self.test_delete_rack()
-        print()
-        
-        # Cleanup
-        self.cleanup_remaining_racks()
-        
-        # Summary
-        print("\n" + "=" * 60)
-        print("📊 TEST SUMMARY")
-        print("=" * 60)
-        print(f"✅ Passed: {self.test_results['passed']}")
-        print(f"❌ Failed: {self.test_results['failed']}")
-        print(f"📈 Success Rate: {(self.test_results['passed'] / (self.test_results['passed'] + self.test_results['failed']) * 100):.1f}%")
-        
-        if self.test_results['errors']:
-            print("\n🚨 FAILED TESTS:")
-            for error in self.test_results['errors']:
-                print(f"   • {error}")
-        
-        return self.test_results['failed'] == 0
+
+import ijson
+import orjson
+import pytest
+
+from tests.helpers import (
+    AUTOCOMPLETE_URL, JSON_HEADERS, RACKS_URL, SEARCH_INDEX_WAIT, SEARCH_URL, TEST_RACKS, rack_url
+)
+
+# Search queries checked against the created racks, one test node each
+SEARCH_TESTS = [
+    {
+        "query": "R001",
+        "description": "Search by rack number",
+        "expected_min_results": 1
+    },
+    {
+        "query": "Ground",
+        "description": "Search by floor name",
+        "expected_min_results": 2
+    },
+    {
+        "query": "Electronics",
+        "description": "Search by item name",
+        "expected_min_results": 1
+    },
+    {
+        "query": "Batteries",
+        "description": "Search for batteries",
+        "expected_min_results": 1
+    },
+    {
+        "query": "nonexistent",
+        "description": "Search for non-existent item",
+        "expected_min_results": 0
+    }
+]
+
+# Tests that list or update the shared racks must run in order on one worker;
+# per-rack and per-query checks are free to run anywhere
+racks_group = pytest.mark.xdist_group("racks")
+
+
+def stream_body(response):
+    """File-like, decompressed body of a stream=True response for ijson"""
+    response.raw.decode_content = True
+    return response.raw
+
+
+@pytest.mark.parametrize("rack", TEST_RACKS, ids=lambda rack: rack["rackNumber"])
+def test_create_racks(created_racks, rack):
+    """Test POST /api/racks/bulk - Create new racks with different floor and item combinations"""
+    created = created_racks.get(rack["rackNumber"])
+    assert created is not None, f"{rack['rackNumber']} was not created"
+    assert created["id"]
+    assert created["floor"] == rack["floor"]
+    assert created["items"] == rack["items"]
+
+
+def test_create_single_rack(session):
+    """Test POST /api/racks - Create one rack through the endpoint the frontend uses"""
+    rack_data = {"rackNumber": "S001", "floor": "Ground Floor", "items": ["Extension Boards"]}
+    response = session.post(RACKS_URL, data=orjson.dumps(rack_data), headers=JSON_HEADERS)
+    assert response.status_code == 200, response.text
+    data = orjson.loads(response.content)
+    try:
+        assert all(key in data for key in ["id", "createdAt", "updatedAt"]), data
+        assert data["rackNumber"] == rack_data["rackNumber"]
+        assert data["floor"] == rack_data["floor"]
+        assert data["items"] == rack_data["items"]
+        # Reads must format timestamps exactly as the create response did
+        fetched = orjson.loads(session.get(rack_url(data["id"])).content)
+        assert (fetched["createdAt"], fetched["updatedAt"]) == (data["createdAt"], data["updatedAt"]), fetched
+    finally:
+        if "id" in data:
+            session.delete(rack_url(data["id"]))
+
+
+@racks_group
+def test_get_all_racks(session, created_racks):
+    """Test GET /api/racks - Get racks grouped by floor"""
+    counts = {}
+    floor = None
+    with session.get(RACKS_URL, stream=True) as response:
+        assert response.status_code == 200, response.text
+        # Count rack objects per floor from parse events without building them
+        for prefix, event, value in ijson.parse(stream_body(response)):
+            if prefix == "floors" and event == "map_key":
+                floor = value
+                counts[floor] = 0
+            elif event == "start_map" and prefix == f"floors.{floor}.item":
+                counts[floor] += 1
+
+    floors_found = list(counts)
+    total_racks = sum(counts.values())
+    expected_floors = ["Ground Floor", "1st Floor", "2nd Floor"]
+    assert all(floor in floors_found for floor in expected_floors), floors_found
+    assert total_racks >= 5, f"Floors: {floors_found}, Total: {total_racks}"
+
+
+def test_get_racks_pagination(session, created_racks):
+    """Test GET /api/racks?after_floor={cursor} - Follow nextCursor through every floor"""
+    floors = []
+    params = {"limit": 1}
+    while True:
+        response = session.get(RACKS_URL, params=params)
+        assert response.status_code == 200, response.text
+        data = orjson.loads(response.content)
+        assert len(data["floors"]) <= 1, data["floors"].keys()
+        floors.extend(data["floors"])
+        if data["nextCursor"] is None:
+            break
+        assert data["nextCursor"] == floors[-1], data["nextCursor"]
+        params["after_floor"] = data["nextCursor"]
+
+    assert floors == sorted(set(floors)), floors
+    assert {rack["floor"] for rack in TEST_RACKS} <= set(floors), floors
+
+
+@pytest.mark.parametrize("after_floor", ["पहली मंज़िल", "Floor – 2", 'a"b'])
+def test_get_racks_cursor_etag(session, after_floor):
+    """Test GET /api/racks?after_floor={floor} - Any floor name cursor gets a valid ETag"""
+    response = session.get(RACKS_URL, params={"after_floor": after_floor, "limit": 1})
+    assert response.status_code == 200, response.text
+    assert re.fullmatch(r'W/"[^"]+"', response.headers.get("ETag", "")), response.headers
+
+
+@racks_group
+def test_get_specific_rack(session, created_racks):
+    """Test GET /api/racks/{rack_id} - Get specific rack by ID"""
+    rack_id = created_racks["R001"]["id"]
+    response = session.get(rack_url(rack_id))
+    assert response.status_code == 200, response.text
+    assert orjson.loads(response.content).get("id") == rack_id
+
+
+def test_get_specific_rack_invalid_id(session):
+    """Test GET /api/racks/{rack_id} - Unknown IDs return 404"""
+    response = session.get(rack_url("invalid-rack-id-12345"))
+    assert response.status_code == 404
+
+
+@racks_group
+def test_update_rack(session, created_racks):
+    """Test PUT /api/racks/{rack_id} - Update rack information"""
+    rack_id = created_racks["R001"]["id"]
+    update_data = {
+        "rackNumber": "R001-UPDATED",
+        "floor": "Ground Floor",
+        "items": ["Electronics", "Mobile Phones", "Chargers", "Headphones", "Tablets"]
+    }
+
+    response = session.put(rack_url(rack_id), data=orjson.dumps(update_data), headers=JSON_HEADERS)
+    assert response.status_code == 200, response.text
+    data = orjson.loads(response.content)
+    assert data.get("rackNumber") == update_data["rackNumber"], data
+    assert len(data.get("items", [])) == 5, data
+
+
+def search_once(session, query):
+    """Top-level keys and rack count of one streamed search response"""
+    keys = set()
+    racks_count = 0
+    with session.get(SEARCH_URL, params={"q": query}, stream=True) as response:
+        assert response.status_code == 200, f"{query}: {response.text}"
+        for prefix, event, value in ijson.parse(stream_body(response)):
+            if prefix == "" and event == "map_key":
+                keys.add(value)
+            elif prefix == "racks.item" and event == "start_map":
+                racks_count += 1
+    return keys, racks_count
+
+
+def test_get_rack_conditional(session):
+    """Test GET /api/racks/{rack_id} with If-None-Match - 304 until the rack changes"""
+    rack_data = {"rackNumber": "E001", "floor": "Ground Floor", "items": ["Switches"]}
+    created = session.post(RACKS_URL, data=orjson.dumps(rack_data), headers=JSON_HEADERS)
+    assert created.status_code == 200, created.text
+    url = rack_url(orjson.loads(created.content)["id"])
+    try:
+        # A write from another worker between the two GETs changes the tag, so retry a few times
+        for _ in range(5):
+            etag = session.get(url).headers["ETag"]
+            response = session.get(url, headers={"If-None-Match": etag})
+            if response.status_code == 304:
+                break
+        assert response.status_code == 304, response.text
+
+        update = session.put(url, data=orjson.dumps({"items": ["Switches", "Sockets"]}), headers=JSON_HEADERS)
+        assert update.status_code == 200, update.text
+        response = session.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200, response.text
+        assert response.headers["ETag"] != etag
+    finally:
+        session.delete(url)
+
+
+@pytest.mark.parametrize("test", SEARCH_TESTS, ids=lambda test: test["query"])
+def test_search_functionality(session, created_racks, test):
+    """Test GET /api/racks/search?q={query} - Search functionality"""
+    # Freshly seeded racks only show up once Atlas Search has indexed them
+    deadline = time.monotonic() + SEARCH_INDEX_WAIT
+    keys, racks_count = search_once(session, test["query"])
+    while racks_count < test["expected_min_results"] and time.monotonic() < deadline:
+        time.sleep(0.5)
+        keys, racks_count = search_once(session, test["query"])
+
+    assert {"racks", "matchedItems"} <= keys, keys
+    assert racks_count >= test["expected_min_results"], test["description"]
+
+
+def test_search_empty_query(session):
+    """Test search edge case - empty queries are rejected"""
+    response = session.get(SEARCH_URL, params={"q": ""})
+    assert response.status_code == 422
+
+
+def test_search_special_characters(session):
+    """Test search edge case - special characters are handled"""
+    response = session.get(SEARCH_URL, params={"q": "R0*1"})
+    assert response.status_code == 200, response.text
+
+
+def test_autocomplete_prefix(session, created_racks):
+    """Test GET /api/racks/autocomplete?prefix={prefix} - Rack number prefix lookup"""
+    response = session.get(AUTOCOMPLETE_URL, params={"prefix": "R00"})
+    assert response.status_code == 200, response.text
+    data = orjson.loads(response.content)
+    assert all(rack["rackNumber"].startswith("R00") for rack in data), data
+    # Match on ids; test_update_rack may have renamed R001 to R001-UPDATED
+    ids = {rack["id"] for rack in data}
+    assert {created_racks["R001"]["id"], created_racks["R002"]["id"]} <= ids, data
+
+
+def test_autocomplete_floor_filter(session, created_racks):
+    """Test GET /api/racks/autocomplete?floor={floor} - Suggestions stay on one floor"""
+    response = session.get(AUTOCOMPLETE_URL, params={"prefix": "R10", "floor": "1st Floor"})
+    assert response.status_code == 200, response.text
+    data = orjson.loads(response.content)
+    assert all(rack["floor"] == "1st Floor" for rack in data), data
+    ids = {rack["id"] for rack in data}
+    assert {created_racks["R101"]["id"], created_racks["R102"]["id"]} <= ids, data
+
+    response = session.get(AUTOCOMPLETE_URL, params={"prefix": "R00", "floor": "1st Floor"})
+    assert response.status_code == 200, response.text
+    ids = {rack["id"] for rack in orjson.loads(response.content)}
+    assert created_racks["R001"]["id"] not in ids
+    assert created_racks["R002"]["id"] not in ids
+
+
+def test_autocomplete_empty_prefix(session):
+    """Test autocomplete edge case - empty prefixes are rejected"""
+    response = session.get(AUTOCOMPLETE_URL, params={"prefix": ""})
+    assert response.status_code == 422
+
+
+def test_delete_rack(session):
+    """Test DELETE /api/racks/{rack_id} - Delete rack"""
+    # Delete a rack of its own so reordering (--ff) can never remove a shared one
+    rack_data = {"rackNumber": "D001", "floor": "Ground Floor", "items": ["Fuses"]}
+    created = session.post(RACKS_URL, data=orjson.dumps(rack_data), headers=JSON_HEADERS)
+    assert created.status_code == 200, created.text
+    rack_id = orjson.loads(created.content)["id"]
+
+    response = session.delete(rack_url(rack_id))
+    assert response.status_code == 200, response.text
+    assert "deleted" in orjson.loads(response.content).get("message", "").lower()
+
+
+def test_delete_rack_invalid_id(session):
+    """Test DELETE /api/racks/{rack_id} - Unknown IDs return 404"""
+    response = session.delete(rack_url("non-existent-rack-id"))
+    assert response.status_code == 404
+
 
 if __name__ == "__main__":
-    tester = RackInventoryTester()
-    success = tester.run_all_tests()
-    
-    if success:
-        print("\n🎉 All tests passed! Backend is working correctly.")
-        exit(0)
-    else:
-        print(f"\n💥 {tester.test_results['failed']} test(s) failed. Check the errors above.")
-        exit(1)
\ No newline at end of file
+    sys.exit(pytest.main([
+        __file__, "-x", "--ff", "-n", "auto", "--dist=loadgroup",
+        "--html=report.html", "--self-contained-html"
+    ]))
@@ -0,0 +1,165 @@
+"""
+Shared fixtures for the MADAN STORE backend API tests
+"""
+
+import json
+import warnings
+
+import orjson
+import pytest
+import requests
+from filelock import FileLock
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+from tests.helpers import (
+    BULK_URL, JSON_HEADERS, RACKS_URL, ROOT_URL, TEST_RACKS, TIMEOUT, fan_out, gen_racks, rack_url
+)
+
+
+class TimeoutSession(requests.Session):
+    """requests.Session that applies a default timeout to every request"""
+
+    def __init__(self, timeout):
+        super().__init__()
+        self.default_timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.default_timeout)
+        return super().request(method, url, **kwargs)
+
+
+@pytest.fixture(scope="session")
+def session():
+    """One pooled keep-alive HTTP session shared by every test in a worker"""
+    with TimeoutSession(TIMEOUT) as s:
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            # Only reads are retried; a retried PUT/DELETE may repeat a write that already happened
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=frozenset({"GET", "HEAD"})
+            )
+        )
+        s.mount("https://", adapter)
+        s.mount("http://", adapter)
+        s.headers.update({"Connection": "keep-alive", "Accept-Encoding": "gzip"})
+        yield s
+
+
+def check_backend():
+    """Test GET /api/ - abort the whole run if the API root is not healthy"""
+    try:
+        response = requests.get(ROOT_URL, timeout=TIMEOUT)
+    except requests.RequestException as e:
+        pytest.exit(f"Backend unreachable at {ROOT_URL}: {e}", returncode=1)
+    if response.status_code != 200:
+        pytest.exit(f"Root endpoint returned {response.status_code}: {response.text}", returncode=1)
+    message = orjson.loads(response.content).get("message", "")
+    if "MADAN STORE" not in message:
+        pytest.exit(f"Unexpected root endpoint response: {message!r}", returncode=1)
+
+
+def pytest_collection_finish(session):
+    """Check the backend once tests are collected, unless nothing will run"""
+    # Exiting from inside an xdist worker crashes the run and hides the reason;
+    # the controller checks instead, in pytest_xdist_node_collection_finished
+    if hasattr(session.config, "workerinput"):
+        return
+    if session.items and not session.config.option.collectonly:
+        check_backend()
+
+
+backend_checked = False
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_node_collection_finished(node, ids):
+    """Check the backend on the xdist controller before any test is scheduled"""
+    global backend_checked
+    if backend_checked or not ids or node.config.option.collectonly:
+        return
+    backend_checked = True
+    check_backend()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--rack-count", type=int, default=0,
+        help="seed this many generated racks alongside TEST_RACKS for load runs"
+    )
+
+
+def seed_racks(session, racks):
+    """Create racks on the server and return them keyed by rack number"""
+    response = session.post(BULK_URL, data=orjson.dumps(racks), headers=JSON_HEADERS)
+    if response.status_code in (404, 405):
+        # Deployments without the bulk endpoint still get concurrent single creates
+        bodies = [orjson.dumps(rack) for rack in racks]
+        responses = fan_out(lambda body: session.post(RACKS_URL, data=body, headers=JSON_HEADERS), bodies)
+        for rack_data, single in zip(racks, responses):
+            assert single.status_code == 200, f"Create {rack_data['rackNumber']}: {single.text}"
+        created = [orjson.loads(single.content) for single in responses]
+    else:
+        assert response.status_code == 200, f"Bulk create: {response.text}"
+        created = orjson.loads(response.content)
+
+    assert len(created) == len(racks), created
+    for data in created:
+        assert all(key in data for key in ["id", "rackNumber", "floor", "items"]), data
+    return {data["rackNumber"]: data for data in created}
+
+
+def remove_racks(session, racks):
+    """Delete seeded racks in parallel; ones already deleted by a test just return 404"""
+    def delete(rack):
+        try:
+            return session.delete(rack_url(rack["id"]))
+        except requests.RequestException as e:
+            return e
+
+    rack_list = list(racks.values())
+    for rack, result in zip(rack_list, fan_out(delete, rack_list)):
+        if isinstance(result, Exception):
+            warnings.warn(f"Failed to cleanup rack {rack['id']}: {result}")
+        elif result.status_code not in (200, 404):
+            warnings.warn(f"Failed to cleanup rack {rack['id']}: {result.status_code}")
+
+
+@pytest.fixture(scope="session")
+def created_racks(request, session, tmp_path_factory, worker_id):
+    """Create the test racks once per run and yield them keyed by rack number
+
+    Under xdist the first worker to get here seeds the racks and the last one
+    to finish deletes them; a file lock guards the shared state file.
+    """
+    to_create = TEST_RACKS + gen_racks(request.config.getoption("rack_count"))
+    if worker_id == "master":
+        racks = seed_racks(session, to_create)
+        yield racks
+        remove_racks(session, racks)
+        return
+
+    state_file = tmp_path_factory.getbasetemp().parent / "created_racks.json"
+    lock = FileLock(f"{state_file}.lock")
+    with lock:
+        if state_file.is_file():
+            state = json.loads(state_file.read_text())
+            state["users"] += 1
+        else:
+            state = {"racks": seed_racks(session, to_create), "users": 1}
+        state_file.write_text(json.dumps(state))
+
+    yield state["racks"]
+
+    with lock:
+        state = json.loads(state_file.read_text())
+        state["users"] -= 1
+        if state["users"]:
+            state_file.write_text(json.dumps(state))
+        else:
+            remove_racks(session, state["racks"])
+            state_file.unlink()
@@ -95,21 +95,21 @@ export default function App() {
   const [editingRack, setEditingRack] = useState(null);
   const [viewingRack, setViewingRack] = useState(null);
   const [loading, setLoading] = useState(false);
-  const [page, setPage] = useState(1);
+  const [cursor, setCursor] = useState(null);
   const [hasMore, setHasMore] = useState(true);
 
   // Fetch Logic handles initial load and "Load More" pagination
-  const fetchRacks = async (pageNum = 1) => {
+  const fetchRacks = async (afterFloor = null) => {
     setLoading(true);
     try {
-      const response = await axios.get(`${API}/racks`, { params: { page: pageNum, limit: 10 } });
-      setRacks(prev => pageNum === 1 ? response.data : { ...prev, ...response.data });
+      const params = afterFloor ? { after_floor: afterFloor, limit: 10 } : { limit: 10 };
+      const response = await axios.get(`${API}/racks`, { params });
+      const { floors, nextCursor } = response.data;
+      setRacks(prev => afterFloor ? { ...prev, ...floors } : floors);
       
-      // If the response contains fewer items than the limit, there's no more data
-      if (Object.keys(response.data).length < 1) setHasMore(false);
-      else setHasMore(true);
-      
-      setPage(pageNum);
+      // The server only hands back a cursor while more floors remain
+      setHasMore(Boolean(nextCursor));
+      setCursor(nextCursor);
     } catch (err) { 
       console.error("Fetch failed:", err); 
     } finally { 
@@ -127,7 +127,7 @@ export default function App() {
     }
   };
 
-  useEffect(() => { fetchRacks(1); }, []);
+  useEffect(() => { fetchRacks(); }, []);
 
   useEffect(() => {
     const controller = new AbortController();
@@ -241,7 +241,7 @@ export default function App() {
         {hasMore && !searchQuery && !loading && (
           <div style={{ textAlign: 'center', marginTop: '60px' }}>
             <button 
-              onClick={() => fetchRacks(page + 1)} 
+              onClick={() => fetchRacks(cursor)} 
               style={{ background: 'white', border: '1px solid #e2e8f0', padding: '12px 32px', borderRadius: '16px', fontSize: '14px', fontWeight: '600', color: '#475569', cursor: 'pointer', transition: 'all 0.2s' }}
             >
               Load More Floors
@@ -255,14 +255,14 @@ export default function App() {
         {showAddForm && (
           <AddRackForm 
             setShowAddForm={setShowAddForm} 
-            fetchRacks={() => fetchRacks(1)} 
+            fetchRacks={() => fetchRacks()} 
           />
         )}
         {editingRack && (
           <EditRackForm 
             rack={editingRack} 
             setEditingRack={setEditingRack} 
-            fetchRacks={() => fetchRacks(1)} 
+            fetchRacks={() => fetchRacks()} 
           />
         )}
         {viewingRack && (
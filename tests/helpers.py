@@ -0,0 +1,80 @@
+"""
+Shared configuration and helpers for the MADAN STORE backend API tests
+"""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# Configuration
+BASE_URL = "https://374afd2f-5ee9-4ce8-9228-83f6ad638fdc.preview.emergentagent.com/api"
+TIMEOUT = 30
+MAX_PARALLEL_REQUESTS = 32
+# Atlas Search indexes new racks asynchronously; searches poll this long for them
+SEARCH_INDEX_WAIT = 30
+# Request bodies are pre-serialized with orjson and sent as raw data
+JSON_HEADERS = {"Content-Type": "application/json"}
+ROOT_URL = f"{BASE_URL}/"
+RACKS_URL = f"{BASE_URL}/racks"
+BULK_URL = f"{RACKS_URL}/bulk"
+SEARCH_URL = f"{RACKS_URL}/search"
+AUTOCOMPLETE_URL = f"{RACKS_URL}/autocomplete"
+
+# Racks with different floor and item combinations, created once per run
+TEST_RACKS = [
+    {
+        "rackNumber": "R001",
+        "floor": "Ground Floor",
+        "items": ["Electronics", "Mobile Phones", "Chargers", "Headphones"]
+    },
+    {
+        "rackNumber": "R002",
+        "floor": "Ground Floor",
+        "items": ["Cables", "USB Cables", "HDMI Cables", "Power Cables"]
+    },
+    {
+        "rackNumber": "R101",
+        "floor": "1st Floor",
+        "items": ["Batteries", "AA Batteries", "AAA Batteries", "Rechargeable Batteries"]
+    },
+    {
+        "rackNumber": "R102",
+        "floor": "1st Floor",
+        "items": ["Computer Accessories", "Keyboards", "Mouse", "Webcams"]
+    },
+    {
+        "rackNumber": "R201",
+        "floor": "2nd Floor",
+        "items": ["Storage Devices", "Hard Drives", "USB Drives", "Memory Cards"]
+    }
+]
+
+FLOORS = ("Ground Floor", "1st Floor", "2nd Floor")
+
+
+def gen_racks(n, seed=0):
+    """Deterministically generate n extra racks for load runs (--rack-count)"""
+    rng = random.Random(seed)
+    return [
+        {
+            "rackNumber": f"G{i:04d}",
+            "floor": rng.choice(FLOORS),
+            "items": [f"Item{i}_{j}" for j in range(rng.randint(1, 8))]
+        }
+        for i in range(n)
+    ]
+
+
+@lru_cache(maxsize=None)
+def rack_url(rack_id):
+    """URL of a single rack, built once per id"""
+    return f"{RACKS_URL}/{rack_id}"
+
+
+def fan_out(func, args):
+    """Run independent requests concurrently over the pooled session, keeping order"""
+    args = list(args)
+    if not args:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(args), MAX_PARALLEL_REQUESTS)) as executor:
+        return list(executor.map(func, args))